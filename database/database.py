@@ -1,214 +1,432 @@
-import hashlib
+import atexit
+import logging
 import os
+import queue
 import sqlite3
-from typing import Optional
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 # Database file path - store in the same directory as this script
-DB_PATH = os.path.join(os.path.dirname(__file__), 'app.db')
+_DB_DIR = os.path.dirname(__file__)
+DB_PATH = os.path.join(_DB_DIR, 'app.db')
+# Ensure data directory exists (once, rather than on every connection)
+os.makedirs(_DB_DIR, exist_ok=True)
+
+# Connection pool: one writer shared behind a lock plus a few readers that
+# WAL lets run alongside it. Opened lazily for the current DB_PATH.
+READ_POOL_SIZE = 4
+_POOL_PATH = None
+_POOL_LOCK = threading.Lock()
+_WRITER = None
+_READERS = None
+# Serializes writes on the writer connection across request threads; it is
+# re-entrant so a write function can run inside an open transaction()
+_WRITE_LOCK = threading.RLock()
+# How many _write_conn blocks the lock holder currently has open, and which
+# thread that is
+_WRITE_DEPTH = 0
+_WRITE_OWNER = None
+
+# Password hashing parameters. New hashes use scrypt; PBKDF2 hashes from
+# older databases are still accepted and upgraded on the next login.
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+PBKDF2_ITERATIONS = 100000
+
+# Rows per executemany call when importing users in bulk
+BULK_INSERT_CHUNK = 500
+
+# Hot-path user queries, kept as constants so sqlite3's statement cache hits
+SQL_INSERT_USER = sys.intern(
+    "INSERT INTO users (username, password_hash) VALUES (?, ?) ON CONFLICT(username) DO NOTHING RETURNING id"
+)
+SQL_BULK_INSERT_USER = sys.intern("INSERT INTO users (username, password_hash) VALUES (?, ?)")
+SQL_SELECT_USER = sys.intern(
+    "SELECT id, username, password_hash, created_at, updated_at FROM users WHERE username = ?"
+)
+SQL_UPDATE_PW = sys.intern(
+    "UPDATE users SET password_hash = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+)
+
+_CONNECTION_PRAGMAS = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -64000;
+PRAGMA mmap_size = 268435456;
+PRAGMA foreign_keys = ON;
+"""
+
+def _configure(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply the per-connection PRAGMAs used by every connection we open."""
+    # WAL lets readers run alongside a writer and makes NORMAL sync safe;
+    # journal_mode persists in the file, the rest are per-connection
+    conn.executescript(_CONNECTION_PRAGMAS)
+    return conn
 
 def get_db_connection():
     """Get a database connection."""
-    # Ensure data directory exists
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON")
+    conn = _configure(sqlite3.connect(DB_PATH, cached_statements=256))
     conn.row_factory = sqlite3.Row
     return conn
 
+def _open_pooled_connection(isolation_level: Optional[str] = '') -> sqlite3.Connection:
+    """Open a connection that can be handed between request threads."""
+    conn = sqlite3.connect(
+        DB_PATH, check_same_thread=False, cached_statements=256, isolation_level=isolation_level
+    )
+    return _configure(conn)
+
+def _ensure_pool():
+    """Open the writer and reader connections on first use."""
+    global _POOL_PATH, _WRITER, _READERS
+    if _POOL_PATH == DB_PATH:
+        return
+    with _POOL_LOCK:
+        if _POOL_PATH != DB_PATH:
+            # Release the connections to the previous path first
+            _drain_pool()
+            # The writer manages its own transactions (see _write_conn)
+            _WRITER = _open_pooled_connection(isolation_level=None)
+            _READERS = queue.LifoQueue()
+            for _ in range(READ_POOL_SIZE):
+                reader = _open_pooled_connection()
+                # Readers must never take the write lock; a stray write fails fast
+                reader.execute("PRAGMA query_only = 1")
+                _READERS.put(reader)
+            _POOL_PATH = DB_PATH
+
+def _drain_pool():
+    """Close the writer and every idle reader; the caller holds _POOL_LOCK."""
+    global _POOL_PATH, _WRITER, _READERS
+    if _WRITER is not None:
+        _WRITER.close()
+    while _READERS is not None and not _READERS.empty():
+        _READERS.get_nowait().close()
+    _POOL_PATH = _WRITER = _READERS = None
+
+@atexit.register
+def _close_pool():
+    """Close the pooled connections on interpreter shutdown."""
+    with _POOL_LOCK:
+        _drain_pool()
+
+@contextmanager
+def _read_conn():
+    """Borrow a reader connection from the pool for SELECT-only work."""
+    _ensure_pool()
+    # Inside an open transaction() this thread's uncommitted writes are only
+    # visible on the writer, so read through it instead
+    if _WRITE_DEPTH > 0 and _WRITE_OWNER == threading.get_ident():
+        yield _WRITER
+        return
+    readers = _READERS
+    conn = readers.get()
+    try:
+        yield conn
+    finally:
+        readers.put(conn)
+
+@contextmanager
+def _write_conn():
+    """Hold the writer connection in a transaction that commits on success."""
+    global _WRITE_DEPTH, _WRITE_OWNER
+    _ensure_pool()
+    with _WRITE_LOCK:
+        # Nested blocks join the enclosing transaction through a savepoint, so
+        # a failure inside one only undoes its own writes
+        nested = _WRITE_DEPTH > 0
+        # Otherwise take the write lock up front so WAL never has to upgrade
+        # a deferred transaction mid-way and hand back SQLITE_BUSY
+        _WRITER.execute("SAVEPOINT nested_write" if nested else "BEGIN IMMEDIATE")
+        _WRITE_DEPTH += 1
+        _WRITE_OWNER = threading.get_ident()
+        try:
+            yield _WRITER
+        except BaseException:
+            if nested:
+                _WRITER.execute("ROLLBACK TO nested_write")
+                _WRITER.execute("RELEASE nested_write")
+            else:
+                _WRITER.execute("ROLLBACK")
+            raise
+        else:
+            _WRITER.execute("RELEASE nested_write" if nested else "COMMIT")
+        finally:
+            _WRITE_DEPTH -= 1
+            if not _WRITE_DEPTH:
+                _WRITE_OWNER = None
+
+def transaction():
+    """Group several writes into a single transaction that commits once on success.
+
+    Write functions called inside the block reuse it instead of committing
+    on their own, and reads made inside it see its uncommitted writes.
+    """
+    return _write_conn()
+
 def read_sql_file(file_path: str) -> str:
     """Reads a SQL file and returns its content as a string."""
     # Construct a path relative to this script
-    base_dir = os.path.dirname(__file__)
+    base_dir = _DB_DIR
     full_path = os.path.join(base_dir, file_path)
     with open(full_path, 'r') as f:
         return f.read()
 
+# Bumped whenever a migration is added; stored in PRAGMA user_version
+SCHEMA_VERSION = 6
+
+# Schema for all tables and indexes, applied statement by statement inside
+# init_database's migration transaction
+_INIT_DDL = """
+
+-- Table for storing users (must be created first)
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL DEFAULT '',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Table for storing skill tests
+CREATE TABLE IF NOT EXISTS skill_tests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL CHECK(name != ''),
+    description TEXT NOT NULL CHECK(description != '')
+);
+
+-- Table for storing user quiz results
+CREATE TABLE IF NOT EXISTS quiz_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    skill_test_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    start_time TIMESTAMP NOT NULL,
+    end_time TIMESTAMP,
+    score INTEGER DEFAULT 0 CHECK(score >= 0 AND score <= 100),
+    total_questions INTEGER DEFAULT 0,
+    FOREIGN KEY (skill_test_id) REFERENCES skill_tests(id)
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+-- Table for storing question information
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    skill_test_id INTEGER NOT NULL,
+    question_type TEXT NOT NULL DEFAULT 'text_input' CHECK(question_type IN ('multiple_choice', 'text_input')),
+    prompt TEXT NOT NULL CHECK(prompt != ''),
+    answer TEXT NOT NULL CHECK(answer != ''),
+    category TEXT NOT NULL CHECK(category != ''),
+    choices TEXT,
+    correct_answers INTEGER NOT NULL DEFAULT 0,
+    incorrect_answers INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (skill_test_id) REFERENCES skill_tests(id)
+);
+
+-- Table for storing the questions in a quiz result
+CREATE TABLE IF NOT EXISTS quiz_result_questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    quiz_result_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    user_answer TEXT NOT NULL CHECK(user_answer != ''),
+    is_correct BOOLEAN NOT NULL,
+    FOREIGN KEY (quiz_result_id) REFERENCES quiz_results(id)
+    FOREIGN KEY (question_id) REFERENCES questions(id)
+);
+
+-- Table for storing user stats over time to track progress and improvement over time
+CREATE TABLE IF NOT EXISTS user_skill_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    skill_test_id INTEGER NOT NULL,
+    correct_answers INTEGER NOT NULL CHECK(correct_answers >= 0),
+    incorrect_answers INTEGER NOT NULL CHECK(incorrect_answers >= 0),
+    FOREIGN KEY (user_id) REFERENCES users(id)
+    FOREIGN KEY (skill_test_id) REFERENCES skill_tests(id)
+);
+
+-- Table for storing study guides
+CREATE TABLE IF NOT EXISTS study_guides (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    skill_test_id INTEGER NOT NULL,
+    content TEXT NOT NULL CHECK(content != ''),
+    FOREIGN KEY (skill_test_id) REFERENCES skill_tests(id)
+);
+
+-- Indexes for better query performance
+-- One answer per question per quiz result; lets answers be saved with an
+-- upsert and doubles as the lookup index for a result's answers. Older
+-- files kept the latest row from the previous delete-then-insert scheme.
+DELETE FROM quiz_result_questions WHERE id NOT IN (
+    SELECT MAX(id) FROM quiz_result_questions GROUP BY quiz_result_id, question_id
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_quiz_result_questions_result_question
+    ON quiz_result_questions(quiz_result_id, question_id);
+DROP INDEX IF EXISTS idx_quiz_result_questions_quiz_result_id;
+-- Covers the per-result correct/incorrect counts without touching the table
+CREATE INDEX IF NOT EXISTS idx_quiz_result_questions_result_correct
+    ON quiz_result_questions(quiz_result_id, is_correct);
+CREATE INDEX IF NOT EXISTS idx_quiz_result_questions_question_id ON quiz_result_questions(question_id);
+CREATE INDEX IF NOT EXISTS idx_user_skill_stats_skill_test_id ON user_skill_stats(skill_test_id);
+
+-- Composite indexes for per-user, per-test lookups; the trailing columns
+-- make them covering, and the user_id prefix replaces the old single-column indexes
+CREATE INDEX IF NOT EXISTS idx_user_skill_stats_user_skill
+    ON user_skill_stats(user_id, skill_test_id, correct_answers, incorrect_answers);
+CREATE INDEX IF NOT EXISTS idx_quiz_results_user_skill ON quiz_results(user_id, skill_test_id, score);
+DROP INDEX IF EXISTS idx_user_skill_stats_user_id;
+DROP INDEX IF EXISTS idx_quiz_results_user_id;
+
+-- Leaderboard: filter by test and read rows already ordered by score, so
+-- no temp B-tree sort is needed; also covers lookups by skill_test_id alone
+CREATE INDEX IF NOT EXISTS idx_quiz_results_skill_score ON quiz_results(skill_test_id, score DESC, end_time);
+DROP INDEX IF EXISTS idx_quiz_results_skill_test_id;
+
+-- Key/value bookkeeping, e.g. which insert_data.sql is loaded
+CREATE TABLE IF NOT EXISTS app_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def _split_sql_statements(script: str):
+    """Split a SQL script into single statements that cursor.execute accepts."""
+    statement = ''
+    for piece in script.split(';'):
+        statement += piece + ';'
+        # A ';' inside a string literal leaves the statement incomplete
+        if sqlite3.complete_statement(statement):
+            if statement.strip(' \t\r\n;'):
+                yield statement
+            statement = ''
+
+def _load_seed_data(cursor: sqlite3.Cursor, sql_content: str, seed_hash: str) -> bool:
+    """Apply insert_data.sql unless that exact file is already loaded. Returns True if it loaded."""
+    conn = cursor.connection
+    # Durability can be relaxed because a failed load is simply retried next start
+    previous_sync = cursor.execute("PRAGMA synchronous").fetchone()[0]
+    cursor.execute("PRAGMA synchronous = OFF")
+    try:
+        # Check and load under the write lock so concurrently starting
+        # workers load the seed once between them
+        cursor.execute("BEGIN IMMEDIATE")
+        row = cursor.execute("SELECT value FROM app_meta WHERE key = 'seed_hash'").fetchone()
+        if row and row[0] == seed_hash:
+            conn.rollback()
+            return False
+        # The seed rows carry fixed ids and upsert only their content columns,
+        # so rows that quiz answers point at are updated in place and their
+        # other columns are left alone
+        for statement in _split_sql_statements(sql_content):
+            cursor.execute(statement)
+        cursor.execute(
+            "INSERT INTO app_meta (key, value) VALUES ('seed_hash', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (seed_hash,)
+        )
+        conn.commit()
+        return True
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        cursor.execute(f"PRAGMA synchronous = {int(previous_sync)}")
+
 def init_database():
     """Initialize the database with required tables."""
+    import hashlib
+    
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute("PRAGMA foreign_keys = ON")
-
-        # Table for storing users (must be created first)
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL UNIQUE,
-                password_hash TEXT NOT NULL DEFAULT '',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            """
-        )
-
-        # Table for storing skill tests 
-        cursor.execute("PRAGMA foreign_keys = OFF")
-        cursor.execute("DROP TABLE IF EXISTS skill_tests;")
-        cursor.execute("PRAGMA foreign_keys = ON")
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS skill_tests (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL CHECK(name != ''),
-                description TEXT NOT NULL CHECK(description != '')
-            );
-            """
-        )
-        
-
-        # Table for storing user quiz results
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS quiz_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                skill_test_id INTEGER NOT NULL,
-                user_id INTEGER NOT NULL,
-                start_time TIMESTAMP NOT NULL,
-                end_time TIMESTAMP,
-                score INTEGER DEFAULT 0 CHECK(score >= 0 AND score <= 100),
-                total_questions INTEGER DEFAULT 0,
-                FOREIGN KEY (skill_test_id) REFERENCES skill_tests(id)
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            );
-            """
-        )
-        # Table for storing question information
-        cursor.execute("PRAGMA foreign_keys = OFF")
-        cursor.execute("DROP TABLE IF EXISTS questions;")
-        cursor.execute("PRAGMA foreign_keys = ON")
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS questions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                skill_test_id INTEGER NOT NULL,
-                question_type TEXT NOT NULL DEFAULT 'text_input' CHECK(question_type IN ('multiple_choice', 'text_input')),
-                prompt TEXT NOT NULL CHECK(prompt != ''),
-                answer TEXT NOT NULL CHECK(answer != ''),
-                category TEXT NOT NULL CHECK(category != ''),
-                choices TEXT,
-                FOREIGN KEY (skill_test_id) REFERENCES skill_tests(id)
-            );
-            """
-        )
-
-        # Table for storing the questions in a quiz result
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS quiz_result_questions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                quiz_result_id INTEGER NOT NULL,
-                question_id INTEGER NOT NULL,
-                user_answer TEXT NOT NULL CHECK(user_answer != ''),
-                is_correct BOOLEAN NOT NULL,
-                FOREIGN KEY (quiz_result_id) REFERENCES quiz_results(id)
-                FOREIGN KEY (question_id) REFERENCES questions(id)
-            );
-            """
-            )
-
-        # Table for storing user stats over time to track progress and improvement over time
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS user_skill_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                skill_test_id INTEGER NOT NULL,
-                correct_answers INTEGER NOT NULL CHECK(correct_answers >= 0),
-                incorrect_answers INTEGER NOT NULL CHECK(incorrect_answers >= 0),
-                FOREIGN KEY (user_id) REFERENCES users(id)
-                FOREIGN KEY (skill_test_id) REFERENCES skill_tests(id)
-            );
-            """
-        )
-
-        # Table for storing study guides
-        cursor.execute("PRAGMA foreign_keys = OFF")
-        cursor.execute("DROP TABLE IF EXISTS study_guides;")
-        cursor.execute("PRAGMA foreign_keys = ON")
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS study_guides (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                skill_test_id INTEGER NOT NULL,
-                content TEXT NOT NULL CHECK(content != ''),
-                FOREIGN KEY (skill_test_id) REFERENCES skill_tests(id)
-            );
-            """
-        )
-        
-        # Create indexes for better query performance
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_quiz_results_user_id ON quiz_results(user_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_quiz_results_skill_test_id ON quiz_results(skill_test_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_quiz_result_questions_quiz_result_id ON quiz_result_questions(quiz_result_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_quiz_result_questions_question_id ON quiz_result_questions(question_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_skill_stats_user_id ON user_skill_stats(user_id);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_skill_stats_skill_test_id ON user_skill_stats(skill_test_id);")
-        ensure_password_column(cursor)
-        ensure_choices_column(cursor)
+        # Schema setup only reads counts and PRAGMA output; plain tuples suffice
+        cursor.row_factory = None
+        # Tables, indexes and column migrations only need to run once per
+        # schema version. Check and migrate under the write lock so workers
+        # starting together don't race each other through the ALTERs.
+        cursor.execute("BEGIN IMMEDIATE")
+        if cursor.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            for statement in _split_sql_statements(_INIT_DDL):
+                cursor.execute(statement)
+            ensure_password_column(cursor)
+            ensure_choices_column(cursor)
+            ensure_question_stats_columns(cursor)
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
-        print(f"Database initialized at {DB_PATH}")
+        logger.info("Database initialized at %s", DB_PATH)
         
-        # Load and execute insert_data.sql if it exists and table is empty
-        try:
-            # Check if skill_tests table is empty
-            cursor.execute("SELECT COUNT(*) as count FROM skill_tests")
-            count = cursor.fetchone()['count']
-            
-            sql_file_path = os.path.join(os.path.dirname(__file__), 'insert_data.sql')
-            if count == 0 and os.path.exists(sql_file_path):
+        # Load insert_data.sql when it differs from the copy already loaded,
+        # so edits to the seed file reach existing databases
+        sql_file_path = os.path.join(_DB_DIR, 'insert_data.sql')
+        if os.path.exists(sql_file_path):
+            try:
                 sql_content = read_sql_file('insert_data.sql')
-                # Execute the SQL content
-                try:
-                    cursor.executescript(sql_content)
-                    conn.commit()
-                    print("Data from insert_data.sql loaded successfully")
-                except Exception as sql_error:
-                    print(f"Error executing insert_data.sql: {sql_error}")
-                    conn.rollback()
-        except Exception as e:
-            print(f"Warning: Could not load insert_data.sql: {e}")
+                seed_hash = hashlib.sha256(sql_content.encode('utf-8')).hexdigest()
+                if _load_seed_data(cursor, sql_content, seed_hash):
+                    logger.info("Data from insert_data.sql loaded successfully")
+            except Exception as e:
+                logger.error("Error executing insert_data.sql: %s", e)
+
+        # Refresh planner statistics where they are missing or stale
+        cursor.execute("PRAGMA optimize")
     finally:
         conn.close()
 
 
-def create_user(username: str, password: Optional[str] = None):
-    """Create a new user with optional password. Returns the user id if successful."""
+def create_user(username: str, password: Optional[str] = None) -> Optional[int]:
+    """Create a new user with optional password. Returns the user id, or None if the username is taken."""
     normalized_username = validate_username(username)
     password_hash = hash_password(password) if password else ''
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO users (username, password_hash)
-            VALUES (?, ?)
-            """,
-            (normalized_username, password_hash)
-        )
-        conn.commit()
-        user_id = cursor.lastrowid
-        return user_id
-    finally:
-        conn.close()
+    with _write_conn() as conn:
+        row = conn.execute(SQL_INSERT_USER, (normalized_username, password_hash)).fetchone()
+    return row[0] if row else None
+
+
+def create_users_bulk(pairs: Iterable[Tuple[str, Optional[str]]]) -> int:
+    """Create many users from (username, password) pairs in one transaction. Returns the number created."""
+    pairs = [(validate_username(username), password) for username, password in pairs]
+    passwords = [password for _, password in pairs]
+    if any(passwords):
+        # hashlib releases the GIL while deriving keys, so threads hash in
+        # parallel; one per CPU, since each scrypt call holds 16 MiB
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            hashes = list(executor.map(lambda password: hash_password(password) if password else '', passwords))
+    else:
+        hashes = [''] * len(passwords)
+    rows = [(username, password_hash) for (username, _), password_hash in zip(pairs, hashes)]
+    with _write_conn() as conn:
+        for start in range(0, len(rows), BULK_INSERT_CHUNK):
+            conn.executemany(SQL_BULK_INSERT_USER, rows[start:start + BULK_INSERT_CHUNK])
+    return len(rows)
 
 
 def get_user(username: str):
     """Get user information by username. Returns dict if found, None otherwise."""
-    normalized_username = validate_username(username)
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT * FROM users WHERE username = ?",
-            (normalized_username,)
-        )
-        row = cursor.fetchone()
-        return dict(row) if row else None
-    finally:
-        conn.close()
+    return _get_user_normalized(validate_username(username))
+
+
+def _get_user_normalized(normalized_username: str):
+    """Look up a user by an already-validated username."""
+    with _read_conn() as conn:
+        row = conn.execute(SQL_SELECT_USER, (normalized_username,)).fetchone()
+    if row is None:
+        return None
+    return {
+        'id': row[0],
+        'username': row[1],
+        'password_hash': row[2],
+        'created_at': row[3],
+        'updated_at': row[4]
+    }
 
 
 def login_user(username: str, password: str) -> Optional[dict]:
@@ -217,7 +435,7 @@ def login_user(username: str, password: str) -> Optional[dict]:
     if not password:
         raise ValueError("Password cannot be empty")
 
-    user = get_user(normalized_username)
+    user = _get_user_normalized(normalized_username)
     if user is None:
         return None
 
@@ -230,72 +448,93 @@ def login_user(username: str, password: str) -> Optional[dict]:
         return user
 
     if verify_password(password, stored_hash):
+        if not stored_hash.startswith("scrypt:"):
+            # Upgrade legacy PBKDF2 hashes now that we have the plaintext
+            new_hash = hash_password(password)
+            update_user_password(user["id"], new_hash)
+            user["password_hash"] = new_hash
         return user
     return None
 
 
+def _scrypt(password: str, salt: bytes) -> bytes:
+    """Derive a key from a password using OpenSSL's scrypt."""
+    import hashlib  # imported lazily; loading OpenSSL is only needed for auth
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt,
+        n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=SCRYPT_DKLEN
+    )
+
+
 def hash_password(password: str) -> str:
-    """Hash a password using PBKDF2."""
+    """Hash a password using scrypt."""
     if not password:
         raise ValueError("Password cannot be empty")
     salt = os.urandom(16)
-    derived = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100000)
-    return f"{salt.hex()}:{derived.hex()}"
+    return f"scrypt:{salt.hex()}:{_scrypt(password, salt).hex()}"
 
 
 def verify_password(password: str, stored_hash: str) -> bool:
-    """Verify a password against a stored PBKDF2 hash."""
+    """Verify a password against a stored scrypt or legacy PBKDF2 hash."""
     if not stored_hash:
         return False
+    parts = stored_hash.split(":")
     try:
-        salt_hex, hash_hex = stored_hash.split(":", 1)
+        if len(parts) == 3 and parts[0] == "scrypt":
+            salt = bytes.fromhex(parts[1])
+            expected = bytes.fromhex(parts[2])
+            candidate = _scrypt(password, salt)
+        elif len(parts) == 2:
+            import hashlib
+            salt = bytes.fromhex(parts[0])
+            expected = bytes.fromhex(parts[1])
+            candidate = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PBKDF2_ITERATIONS)
+        else:
+            return False
     except ValueError:
         return False
-    salt = bytes.fromhex(salt_hex)
-    expected = bytes.fromhex(hash_hex)
-    candidate = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100000)
     return constant_time_compare(expected, candidate)
 
 
 def constant_time_compare(val1: bytes, val2: bytes) -> bool:
     """Compare two bytes objects in constant time."""
-    if len(val1) != len(val2):
-        return False
-    result = 0
-    for x, y in zip(val1, val2):
-        result |= x ^ y
-    return result == 0
+    import hmac  # hmac pulls in hashlib, so it is imported lazily too
+    return hmac.compare_digest(val1, val2)
 
 
 def validate_username(username: str) -> str:
     """Validate a username. Returns the username if valid, raises an error if invalid."""
-    if not username or not username.strip():
+    # isspace() rejects blanks without building a stripped copy first; strip()
+    # hands back the same object when there is nothing to trim
+    if not username or username.isspace():
         raise ValueError("Username cannot be empty")
     return username.strip()
 
 
 def update_user_password(user_id: int, password_hash: str) -> None:
     """Persist a newly generated password hash for legacy users."""
-    with get_db_connection() as conn:
-        conn.execute(
-            "UPDATE users SET password_hash = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-            (password_hash, user_id),
-        )
-        conn.commit()
+    with _write_conn() as conn:
+        conn.execute(SQL_UPDATE_PW, (password_hash, user_id))
 
 
 def ensure_password_column(cursor: sqlite3.Cursor):
     """Add password_hash column for older databases."""
-    cursor.execute("PRAGMA table_info(users)")
-    columns = [row["name"] for row in cursor.fetchall()]
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(users)")]
     if "password_hash" not in columns:
         cursor.execute("ALTER TABLE users ADD COLUMN password_hash TEXT NOT NULL DEFAULT ''")
 
 def ensure_choices_column(cursor: sqlite3.Cursor):
     """Add choices column to questions table for multiple choice questions."""
-    cursor.execute("PRAGMA table_info(questions)")
-    columns = [row["name"] for row in cursor.fetchall()]
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(questions)")]
     if "choices" not in columns:
         cursor.execute("ALTER TABLE questions ADD COLUMN choices TEXT")
     # Also ensure question_type has a default for existing rows
     cursor.execute("UPDATE questions SET question_type = 'text_input' WHERE question_type IS NULL OR question_type = ''")
+
+def ensure_question_stats_columns(cursor: sqlite3.Cursor):
+    """Add the per-question correct/incorrect answer counters to the questions table."""
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(questions)")]
+    if "correct_answers" not in columns:
+        cursor.execute("ALTER TABLE questions ADD COLUMN correct_answers INTEGER NOT NULL DEFAULT 0")
+    if "incorrect_answers" not in columns:
+        cursor.execute("ALTER TABLE questions ADD COLUMN incorrect_answers INTEGER NOT NULL DEFAULT 0")
@@ -1,206 +1,356 @@
-from database.database import get_db_connection
+import json
+import sys
+import time
+from functools import lru_cache
+from database.database import _read_conn, _write_conn, validate_username
+
+# SQL run on every answer submission and quiz page view, interned so the
+# sqlite3 statement cache lookup is a pointer comparison
+SQL_UPSERT_ANSWER = sys.intern(
+    "INSERT INTO quiz_result_questions (quiz_result_id, question_id, user_answer, is_correct) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(quiz_result_id, question_id) DO UPDATE SET user_answer = excluded.user_answer, is_correct = excluded.is_correct"
+)
+SQL_SELECT_ANSWER_CORRECT = sys.intern(
+    "SELECT is_correct FROM quiz_result_questions WHERE quiz_result_id = ? AND question_id = ?"
+)
+SQL_UPDATE_QUESTION_STATS = sys.intern(
+    "UPDATE questions SET correct_answers = COALESCE(correct_answers, 0) + ?, "
+    "incorrect_answers = COALESCE(incorrect_answers, 0) + ? WHERE id = ?"
+)
+SQL_SELECT_QUIZ_SESSION = sys.intern(
+    "SELECT id, skill_test_id, user_id, start_time, end_time, score, total_questions FROM quiz_results WHERE id = ?"
+)
+# Applies a whole batch of [question_id, correct, incorrect] deltas in one
+# statement; duplicates are summed first because UPDATE ... FROM applies
+# only one matching source row per target row
+SQL_UPDATE_QUESTION_STATS_BATCH = sys.intern(
+    "UPDATE questions SET correct_answers = COALESCE(correct_answers, 0) + d.correct, "
+    "incorrect_answers = COALESCE(incorrect_answers, 0) + d.incorrect "
+    "FROM (SELECT json_extract(value, '$[0]') AS question_id, "
+    "SUM(json_extract(value, '$[1]')) AS correct, SUM(json_extract(value, '$[2]')) AS incorrect "
+    "FROM json_each(?) GROUP BY 1) AS d "
+    "WHERE questions.id = d.question_id"
+)
+
+# Quiz session writes
+SQL_INSERT_QUIZ_SESSION = sys.intern(
+    "INSERT INTO quiz_results (user_id, skill_test_id, start_time, end_time, score, total_questions) "
+    "VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 0, ?)"
+)
+SQL_INSERT_USER_IF_MISSING = sys.intern("INSERT OR IGNORE INTO users (username) VALUES (?)")
+SQL_INSERT_QUIZ_SESSION_FOR_USERNAME = sys.intern(
+    "INSERT INTO quiz_results (user_id, skill_test_id, start_time, end_time, score, total_questions) "
+    "SELECT id, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 0, ? FROM users WHERE username = ?"
+)
+SQL_FINISH_QUIZ_SESSION = sys.intern(
+    "UPDATE quiz_results SET end_time = CURRENT_TIMESTAMP, score = ?, total_questions = ? WHERE id = ? "
+    "RETURNING skill_test_id"
+)
+
+# Read-side queries, one constant per statement so every call site reuses
+# the same cached prepared statement
+SQL_LIST_SKILL_TESTS = sys.intern("SELECT id, name, description FROM skill_tests")
+SQL_SELECT_QUESTIONS = sys.intern(
+    "SELECT id, skill_test_id, question_type, prompt, answer, category, choices FROM questions WHERE skill_test_id = ? LIMIT ?"
+)
+SQL_SELECT_ANSWERS = sys.intern(
+    "SELECT id, quiz_result_id, question_id, user_answer, is_correct FROM quiz_result_questions WHERE quiz_result_id = ?"
+)
+SQL_COUNT_ANSWERS = sys.intern(
+    "SELECT is_correct, COUNT(*) FROM quiz_result_questions WHERE quiz_result_id = ? GROUP BY is_correct"
+)
+SQL_SELECT_ANSWERS_WITH_QUESTIONS = sys.intern("""
+    SELECT 
+        qrq.id,
+        qrq.quiz_result_id,
+        qrq.question_id,
+        qrq.user_answer,
+        qrq.is_correct,
+        q.id as q_id,
+        q.prompt,
+        q.answer as correct_answer,
+        q.category,
+        q.question_type,
+        q.choices
+    FROM quiz_result_questions qrq
+    JOIN questions q ON qrq.question_id = q.id
+    WHERE qrq.quiz_result_id = ?
+    ORDER BY qrq.question_id ASC
+""")
+# A finished quiz with its answers in one round trip: the session columns
+# repeat on every answer row, and a session with no answers yields one row
+# whose answer columns are NULL
+SQL_SELECT_QUIZ_SUMMARY = sys.intern("""
+    SELECT
+        qr.id,
+        qr.skill_test_id,
+        qr.user_id,
+        qr.start_time,
+        qr.end_time,
+        qr.score,
+        qr.total_questions,
+        u.username,
+        qrq.id as answer_id,
+        qrq.question_id,
+        qrq.user_answer,
+        qrq.is_correct,
+        q.id as q_id,
+        q.prompt,
+        q.answer as correct_answer,
+        q.category,
+        q.question_type,
+        q.choices
+    FROM quiz_results qr
+    LEFT JOIN users u ON u.id = qr.user_id
+    LEFT JOIN quiz_result_questions qrq ON qrq.quiz_result_id = qr.id
+    LEFT JOIN questions q ON q.id = qrq.question_id
+    WHERE qr.id = ?
+    ORDER BY qrq.question_id ASC
+""")
+SQL_SELECT_STUDY_GUIDES = sys.intern(
+    "SELECT id, skill_test_id, content FROM study_guides WHERE skill_test_id = ? ORDER BY id ASC"
+)
+SQL_SELECT_LEADERBOARD = sys.intern("""
+    SELECT qr.id, qr.score, qr.total_questions, qr.start_time, qr.end_time, u.username, st.name as skill_test_name
+    FROM quiz_results qr
+    JOIN users u ON qr.user_id = u.id
+    JOIN skill_tests st ON qr.skill_test_id = st.id
+    WHERE qr.skill_test_id = ? AND qr.end_time > qr.start_time
+    ORDER BY qr.score DESC, qr.end_time ASC
+    LIMIT ?
+""")
+
+# Skill tests and study guides only change when insert_data.sql is reloaded,
+# possibly by another process, so they expire after CONTENT_CACHE_TTL
+# seconds. Leaderboards are invalidated whenever a quiz on that test finishes
+# in this process, and expire after LEADERBOARD_TTL seconds to pick up
+# finishes in other workers.
+CONTENT_CACHE_TTL = 300
+LEADERBOARD_TTL = 30
+LEADERBOARD_CACHE_LIMIT = 100
+_leaderboard_versions = {}
+
+def _rows_as_dicts(cursor):
+    """Materialize a cursor from a pooled connection as a list of dicts."""
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+def _row_as_dict(cursor):
+    """Return the first row of a cursor as a dict, or None if there is none."""
+    row = cursor.fetchone()
+    return dict(zip([column[0] for column in cursor.description], row)) if row else None
 
 def start_quiz_session(user_id: int, skill_test_id: int, total_questions: int = 10) -> int:
     """Start a new quiz session for a user and skill test. Returns the quiz result id."""
     if not user_id or not skill_test_id:
         raise ValueError("User ID and skill test ID are required")
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO quiz_results (user_id, skill_test_id, start_time, end_time, score, total_questions)
-            VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 0, ?)
-            """,
-            (user_id, skill_test_id, max(1, total_questions))
-        )
-        conn.commit()
-        return cursor.lastrowid
-    finally:
-        conn.close()
+    with _write_conn() as conn:
+        return conn.execute(SQL_INSERT_QUIZ_SESSION, (user_id, skill_test_id, max(1, total_questions))).lastrowid
+
+def start_quiz_session_for_username(username: str, skill_test_id: int, total_questions: int = 10) -> int:
+    """Start a quiz session for a username, creating the user if needed, in one transaction. Returns the quiz result id."""
+    normalized_username = validate_username(username)
+    if not skill_test_id:
+        raise ValueError("Skill test ID is required")
+    
+    with _write_conn() as conn:
+        conn.execute(SQL_INSERT_USER_IF_MISSING, (normalized_username,))
+        return conn.execute(
+            SQL_INSERT_QUIZ_SESSION_FOR_USERNAME,
+            (skill_test_id, max(1, total_questions), normalized_username)
+        ).lastrowid
 
 def finish_quiz_session(quiz_result_id: int, score: int, total_questions: int):
     """Finish a quiz session for a user and skill test."""
     if not quiz_result_id:
         raise ValueError("Quiz result ID is required")
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE quiz_results SET end_time = CURRENT_TIMESTAMP, score = ?, total_questions = ? WHERE id = ?",
-            (score, total_questions, quiz_result_id)
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    with _write_conn() as conn:
+        row = conn.execute(SQL_FINISH_QUIZ_SESSION, (score, total_questions, quiz_result_id)).fetchone()
+    if row:
+        invalidate_leaderboard(row[0])
+
+def _ttl_window(ttl: int) -> int:
+    """Number of the ttl-second window we are in; part of a cache key so entries expire."""
+    return int(time.monotonic() // ttl)
+
+@lru_cache(maxsize=1)
+def _cached_skill_tests(window: int):
+    # window only takes part in the cache key
+    with _read_conn() as conn:
+        return tuple(_rows_as_dicts(conn.execute(SQL_LIST_SKILL_TESTS)))
 
 def list_skill_tests():
     """List all skill tests."""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM skill_tests;")
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+    # Copy so callers can't mutate the cached rows
+    return [dict(row) for row in _cached_skill_tests(_ttl_window(CONTENT_CACHE_TTL))]
 
 def get_skill_test_questions(skill_test_id: int, limit: int = 10):
     """Get the questions for a skill test."""
     if not skill_test_id:
         raise ValueError("Skill test ID is required")
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM questions WHERE skill_test_id = ? LIMIT ?", (skill_test_id, limit))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+    with _read_conn() as conn:
+        return _rows_as_dicts(conn.execute(SQL_SELECT_QUESTIONS, (skill_test_id, limit)))
 
 def record_user_answer(session_id: int, question_id: int, user_answer: str, is_correct: bool):
     """Record or update a user's answer for a question within a quiz result."""
     if not session_id or not question_id:
         raise ValueError("Session ID and question ID are required")
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "DELETE FROM quiz_result_questions WHERE quiz_result_id = ? AND question_id = ?",
-            (session_id, question_id)
-        )
-        # Insert new answer
-        cursor.execute(
-            "INSERT INTO quiz_result_questions (quiz_result_id, question_id, user_answer, is_correct) VALUES (?, ?, ?, ?)",
-            (session_id, question_id, user_answer, 1 if is_correct else 0)
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    with _write_conn() as conn:
+        conn.execute(SQL_UPSERT_ANSWER, (session_id, question_id, user_answer, 1 if is_correct else 0))
+
+def get_answer_is_correct(session_id: int, question_id: int):
+    """Get whether the saved answer to a question in a quiz result is correct. Returns None if it is unanswered."""
+    if not session_id or not question_id:
+        raise ValueError("Session ID and question ID are required")
+    
+    with _read_conn() as conn:
+        row = conn.execute(SQL_SELECT_ANSWER_CORRECT, (session_id, question_id)).fetchone()
+    return None if row is None else bool(row[0])
+
+def record_user_answers_bulk(session_id: int, answers):
+    """Record or update many (question_id, user_answer, is_correct) answers for a quiz result in one transaction."""
+    if not session_id:
+        raise ValueError("Session ID is required")
+    rows = [(session_id, question_id, user_answer, 1 if is_correct else 0) for question_id, user_answer, is_correct in answers]
+    if any(not question_id for _, question_id, _, _ in rows):
+        raise ValueError("Question ID is required")
+    if not rows:
+        return
+    
+    with _write_conn() as conn:
+        conn.executemany(SQL_UPSERT_ANSWER, rows)
 
 def update_question_stats(question_id: int, correct_answers: int, incorrect_answers: int):
-    """Update the question stats for a question."""
+    """Add to the correct/incorrect answer counters for a question."""
     if not question_id:
         raise ValueError("Question ID is required")
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE questions SET correct_answers = ?, incorrect_answers = ? WHERE id = ?",
-            (correct_answers, incorrect_answers, question_id)
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    with _write_conn() as conn:
+        conn.execute(SQL_UPDATE_QUESTION_STATS, (correct_answers, incorrect_answers, question_id))
+
+def update_question_stats_many(results):
+    """Add a batch of (question_id, is_correct) outcomes to the question stats in one transaction."""
+    deltas = [[question_id, int(bool(is_correct)), int(not is_correct)] for question_id, is_correct in results]
+    if any(not question_id for question_id, _, _ in deltas):
+        raise ValueError("Question ID is required")
+    if not deltas:
+        return
+    
+    with _write_conn() as conn:
+        conn.execute(SQL_UPDATE_QUESTION_STATS_BATCH, (json.dumps(deltas),))
 
 def get_quiz_session(session_id: int):
     """Get a quiz session by session ID."""
     if not session_id:
         raise ValueError("Session ID is required")
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM quiz_results WHERE id = ?", (session_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
-    finally:
-        conn.close()
+    with _read_conn() as conn:
+        return _row_as_dict(conn.execute(SQL_SELECT_QUIZ_SESSION, (session_id,)))
 
-def get_correct_answers(quiz_result_id: int):
-    """Get the correct answers for a quiz session."""
+def get_answers_partitioned(quiz_result_id: int):
+    """Get the answers for a quiz session in one scan. Returns (correct, incorrect) lists."""
     if not quiz_result_id:
         raise ValueError("Session ID is required")
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM quiz_result_questions WHERE quiz_result_id = ? AND is_correct = 1", (quiz_result_id,))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+    correct, incorrect = [], []
+    with _read_conn() as conn:
+        for answer in _rows_as_dicts(conn.execute(SQL_SELECT_ANSWERS, (quiz_result_id,))):
+            (correct if answer['is_correct'] else incorrect).append(answer)
+    return correct, incorrect
 
-def get_incorrect_answers(quiz_result_id: int):
-    """Get all incorrect answers for a quiz session."""
+def get_answer_counts(quiz_result_id: int):
+    """Count the answers for a quiz session. Returns (correct_count, incorrect_count)."""
     if not quiz_result_id:
         raise ValueError("Session ID is required")
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM quiz_result_questions WHERE quiz_result_id = ? AND is_correct = 0", (quiz_result_id,))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+    with _read_conn() as conn:
+        counts = dict(conn.execute(SQL_COUNT_ANSWERS, (quiz_result_id,)).fetchall())
+    return counts.get(1, 0), counts.get(0, 0)
+
+def get_correct_answers(quiz_result_id: int):
+    """Get the correct answers for a quiz session."""
+    return get_answers_partitioned(quiz_result_id)[0]
+
+def get_incorrect_answers(quiz_result_id: int):
+    """Get all incorrect answers for a quiz session."""
+    return get_answers_partitioned(quiz_result_id)[1]
 
 def get_all_answers_with_questions(quiz_result_id: int):
     """Get all answers for a quiz session with question details. Returns a list of answer dictionaries with question info."""
     if not quiz_result_id:
         raise ValueError("Session ID is required")
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT 
-                qrq.id,
-                qrq.quiz_result_id,
-                qrq.question_id,
-                qrq.user_answer,
-                qrq.is_correct,
-                q.id as q_id,
-                q.prompt,
-                q.answer as correct_answer,
-                q.category,
-                q.question_type,
-                q.choices
-            FROM quiz_result_questions qrq
-            JOIN questions q ON qrq.question_id = q.id
-            WHERE qrq.quiz_result_id = ?
-            ORDER BY qrq.question_id ASC
-            """,
-            (quiz_result_id,)
-        )
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
-    finally:
-        conn.close()
+    with _read_conn() as conn:
+        return _rows_as_dicts(conn.execute(SQL_SELECT_ANSWERS_WITH_QUESTIONS, (quiz_result_id,)))
+
+def get_quiz_summary(session_id: int):
+    """Get a quiz session with its answers and question details in one query. Returns None if the session doesn't exist."""
+    if not session_id:
+        raise ValueError("Session ID is required")
+    
+    with _read_conn() as conn:
+        rows = _rows_as_dicts(conn.execute(SQL_SELECT_QUIZ_SUMMARY, (session_id,)))
+    if not rows:
+        return None
+    
+    first = rows[0]
+    summary = {key: first[key] for key in (
+        'id', 'skill_test_id', 'user_id', 'start_time', 'end_time', 'score', 'total_questions', 'username'
+    )}
+    # Same shape as get_all_answers_with_questions, which inner-joins the
+    # questions: rows without an answer or whose question is gone are skipped
+    summary['answers'] = [{
+        'id': row['answer_id'],
+        'quiz_result_id': row['id'],
+        'question_id': row['question_id'],
+        'user_answer': row['user_answer'],
+        'is_correct': row['is_correct'],
+        'q_id': row['q_id'],
+        'prompt': row['prompt'],
+        'correct_answer': row['correct_answer'],
+        'category': row['category'],
+        'question_type': row['question_type'],
+        'choices': row['choices'],
+    } for row in rows if row['q_id'] is not None]
+    return summary
+
+@lru_cache(maxsize=128)
+def _cached_study_guides(skill_test_id: int, window: int):
+    # window only takes part in the cache key
+    with _read_conn() as conn:
+        return tuple(_rows_as_dicts(conn.execute(SQL_SELECT_STUDY_GUIDES, (skill_test_id,))))
 
 def get_study_guide_by_skill_test(skill_test_id: int):
     """Get study guide content for a skill test."""
     if not skill_test_id:
         raise ValueError("Skill test ID is required")
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM study_guides WHERE skill_test_id = ? ORDER BY id ASC", (skill_test_id,))
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+    return [dict(row) for row in _cached_study_guides(skill_test_id, _ttl_window(CONTENT_CACHE_TTL))]
+
+def _query_leaderboard(skill_test_id: int, limit: int):
+    with _read_conn() as conn:
+        return _rows_as_dicts(conn.execute(SQL_SELECT_LEADERBOARD, (skill_test_id, limit)))
+
+@lru_cache(maxsize=128)
+def _cached_leaderboard(skill_test_id: int, limit: int, version: int, window: int):
+    # version and window only take part in the cache key
+    return tuple(_query_leaderboard(skill_test_id, limit))
 
 def get_leaderboard_by_skill_test(skill_test_id: int, limit: int = 10):
     """Get leaderboard for a skill test with user information."""
     if not skill_test_id:
         raise ValueError("Skill test ID is required")
     
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            """SELECT qr.id, qr.score, qr.total_questions, qr.start_time, qr.end_time, u.username, st.name as skill_test_name
-            FROM quiz_results qr
-            JOIN users u ON qr.user_id = u.id
-            JOIN skill_tests st ON qr.skill_test_id = st.id
-            WHERE qr.skill_test_id = ? AND qr.end_time > qr.start_time
-            ORDER BY qr.score DESC, qr.end_time ASC
-            LIMIT ?""",
-            (skill_test_id, limit)
-        )
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+    if limit > LEADERBOARD_CACHE_LIMIT:
+        return _query_leaderboard(skill_test_id, limit)
+    version = _leaderboard_versions.get(skill_test_id, 0)
+    window = _ttl_window(LEADERBOARD_TTL)
+    return [dict(row) for row in _cached_leaderboard(skill_test_id, limit, version, window)]
+
+def invalidate_leaderboard(skill_test_id: int):
+    """Drop cached leaderboards for a skill test after its results change."""
+    _leaderboard_versions[skill_test_id] = _leaderboard_versions.get(skill_test_id, 0) + 1
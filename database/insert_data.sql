@@ -1,55 +1,68 @@
-INSERT INTO skill_tests (name, description) VALUES
-('Terminal', 'Simulate on-the-spot CLI tasks that validate navigation and command mastery.'),
-('Python Virtual Environments and Maven', 'Tackle mixed-environment workflows, from venv activation to Maven lifecycle knowledge.'),
-('Deploy on AWS', 'Walk through high-level deployment considerations and the services needed to ship safely.');
+INSERT INTO skill_tests (id, name, description) VALUES
+(1, 'Terminal', 'Simulate on-the-spot CLI tasks that validate navigation and command mastery.'),
+(2, 'Python Virtual Environments and Maven', 'Tackle mixed-environment workflows, from venv activation to Maven lifecycle knowledge.'),
+(3, 'Deploy on AWS', 'Walk through high-level deployment considerations and the services needed to ship safely.')
+ON CONFLICT(id) DO UPDATE SET
+    name = excluded.name,
+    description = excluded.description;
 
-INSERT INTO questions (skill_test_id, question_type, prompt, answer, category, choices) VALUES
-(1, 'text_input', 'What command lists files in a directory, including hidden ones?', 'ls -a', 'Terminal', NULL),
-(1, 'text_input', 'What command moves a file named notes.txt to /home/user/docs/ and renames it to archive.txt in the same step?', 'mv notes.txt /home/user/docs/archive.txt', 'Terminal', NULL),
-(1, 'text_input', 'What command displays the directory you are currently in?', 'pwd', 'Terminal', NULL),
-(1, 'text_input', 'What command creates a new directory named ''new_folder'' in the current directory?', 'mkdir new_folder', 'Terminal', NULL),
-(1, 'text_input', 'What command changes the current working directory to /home/user/projects/', 'cd /home/user/projects/', 'Terminal', NULL),
-(1, 'text_input', 'What command opens the man page for chmod?', 'man chmod', 'Terminal', NULL),
-(1, 'text_input', 'What command displays the contents of a file named README.md?', 'cat README.md', 'Terminal', NULL),
-(1, 'text_input', 'What command creates a new file named ''todo.txt'' in the current directory?', 'touch todo.txt', 'Terminal', NULL),
-(1, 'text_input', 'What command deletes a file named ''junk.txt'' in the current directory?', 'rm junk.txt', 'Terminal', NULL),
-(1, 'text_input', 'You are in /var/log/nginx/. What command moves you up two directories to /var/?', 'cd ../../var', 'Terminal', NULL),
-(2, 'text_input', 'What command creates a new Python virtual environment?', 'python -m venv .venv', 'Python Virtual Environments and Maven', NULL),
-(2, 'text_input', 'What command activates a Python virtual environment?', 'source .venv/bin/activate', 'Python Virtual Environments and Maven', NULL),
-(2, 'multiple_choice', 'What is the main purpose of creating a Python virtual environment?', 'b', 'Python Virtual Environments and Maven', '["To speed up the development process", "To isolate project dependencies", "To create a new Python version", "To share code between projects"]'),
-(2, 'text_input', 'What command installs packages from the requirements.txt file?', 'pip install -r requirements.txt', 'Python Virtual Environments and Maven', NULL),
-(2, 'multiple_choice', 'What is the correct order of the Maven lifecycle?', 'd', 'Python Virtual Environments and Maven', '["test -> compile -> package -> clean", "compile -> test -> clean -> package", "test -> compile -> package -> clean", "clean -> compile -> test -> package"]'),
-(2, 'multiple_choice', 'What does the pom.xml file contain?', 'a', 'Python Virtual Environments and Maven', '["Server IP addresses", "Project metadata and dependencies", "Java bytecode", "User system settings"]'),
-(2, 'multiple_choice', 'What is the role of third-party libraries in virtual environments?', 'c', 'Python Virtual Environments and Maven', '["They are stored in the OS kernel", "They replace built-in Python modules", "They provide reusable external functionality", "They are not used in virtual environments"]'),
-(2, 'text_input', 'What command packages a Maven project into a JAR file?', 'mvn package', 'Python Virtual Environments and Maven', NULL),
-(2, 'multiple_choice', 'How does the activate and deactivate scripts modify the $PATH?', 'a', 'Python Virtual Environments and Maven', '["They add the virtual environment''s bin directory to the $PATH", "They remove the virtual environment''s bin directory from the $PATH", "They add the virtual environment''s bin directory to the $PATH and remove the system''s bin directory from the $PATH", "They remove the virtual environment''s bin directory from the $PATH and add the system''s bin directory to the $PATH"]'),
-(2, 'multiple_choice', 'What happens if you run a project without activating it''s virtual environment?', 'b', 'Python Virtual Environments and Maven', '["The project will run successfully", "The project will fail to run", "The project will run with limited functionality", "The project will run with full functionality"]'),
-(3, 'multiple_choice', "What is an EC2 instance?", 'a', 'Deploy on AWS', '["A virtual server in the cloud", "A file storage system", "A container orchestration tool", "A managed database service"]'),
-(3, 'text_input', 'Which port must be open for HTTP web traffic?', '80', 'Deploy on AWS', NULL),
-(3, 'multiple_choice', 'Which protocol is used to securely connect to an EC2 instance from your local machine?', 'b', 'Deploy on AWS', '["HTTP", "SSH", "TCP", "HTTPS"]'),
-(3, 'multiple_choice', 'What is the purpose of a firewall?', 'c', 'Deploy on AWS', '["To increase internet speed", "To manage file storage", "To block unauthorized access to a network", "To clean up viruses from a system"]'),
-(3, 'text_input', 'Write the command to enable a systemd service file called flask-app so it starts on boot.', 'sudo systemctl enable flask-app', 'Deploy on AWS', NULL),
-(3, 'text_input', 'Write the curl command to send a request to a web server running on localhost 5000.', 'curl http://localhost:5000', 'Deploy on AWS', NULL),
-(3, 'text_input', 'Write the command to clone a GitHub repository? Example URL: https://github.com/user/webapp.git', 'git clone https://github.com/user/webapp.git', 'Deploy on AWS', NULL),
-(3, 'multiple_choice', 'What is the package manager primarily used in Amazon Linux?', 'a', 'Deploy on AWS', '["yum", "apt", "brew", "pacman"]'),
-(3, 'multiple_choice', 'Which AWS component controls the inbound and outbound traffic for EC2 instances?', 'a', 'Deploy on AWS', '["Security Group", "VPC", "Subnet", "S3 Bucket"]'),
-(3, 'multiple_choice', 'What is the primary purpose of gunicorn?', 'b', 'Deploy on AWS', '["To serve static files to the user", "To manage multiple worker processes and handle incoming HTTP requests", "To compile Python code to bytecode", "To run a Python application"]');
+INSERT INTO questions (id, skill_test_id, question_type, prompt, answer, category, choices) VALUES
+(1, 1, 'text_input', 'What command lists files in a directory, including hidden ones?', 'ls -a', 'Terminal', NULL),
+(2, 1, 'text_input', 'What command moves a file named notes.txt to /home/user/docs/ and renames it to archive.txt in the same step?', 'mv notes.txt /home/user/docs/archive.txt', 'Terminal', NULL),
+(3, 1, 'text_input', 'What command displays the directory you are currently in?', 'pwd', 'Terminal', NULL),
+(4, 1, 'text_input', 'What command creates a new directory named ''new_folder'' in the current directory?', 'mkdir new_folder', 'Terminal', NULL),
+(5, 1, 'text_input', 'What command changes the current working directory to /home/user/projects/', 'cd /home/user/projects/', 'Terminal', NULL),
+(6, 1, 'text_input', 'What command opens the man page for chmod?', 'man chmod', 'Terminal', NULL),
+(7, 1, 'text_input', 'What command displays the contents of a file named README.md?', 'cat README.md', 'Terminal', NULL),
+(8, 1, 'text_input', 'What command creates a new file named ''todo.txt'' in the current directory?', 'touch todo.txt', 'Terminal', NULL),
+(9, 1, 'text_input', 'What command deletes a file named ''junk.txt'' in the current directory?', 'rm junk.txt', 'Terminal', NULL),
+(10, 1, 'text_input', 'You are in /var/log/nginx/. What command moves you up two directories to /var/?', 'cd ../../var', 'Terminal', NULL),
+(11, 2, 'text_input', 'What command creates a new Python virtual environment?', 'python -m venv .venv', 'Python Virtual Environments and Maven', NULL),
+(12, 2, 'text_input', 'What command activates a Python virtual environment?', 'source .venv/bin/activate', 'Python Virtual Environments and Maven', NULL),
+(13, 2, 'multiple_choice', 'What is the main purpose of creating a Python virtual environment?', 'b', 'Python Virtual Environments and Maven', '["To speed up the development process", "To isolate project dependencies", "To create a new Python version", "To share code between projects"]'),
+(14, 2, 'text_input', 'What command installs packages from the requirements.txt file?', 'pip install -r requirements.txt', 'Python Virtual Environments and Maven', NULL),
+(15, 2, 'multiple_choice', 'What is the correct order of the Maven lifecycle?', 'd', 'Python Virtual Environments and Maven', '["test -> compile -> package -> clean", "compile -> test -> clean -> package", "test -> compile -> package -> clean", "clean -> compile -> test -> package"]'),
+(16, 2, 'multiple_choice', 'What does the pom.xml file contain?', 'a', 'Python Virtual Environments and Maven', '["Server IP addresses", "Project metadata and dependencies", "Java bytecode", "User system settings"]'),
+(17, 2, 'multiple_choice', 'What is the role of third-party libraries in virtual environments?', 'c', 'Python Virtual Environments and Maven', '["They are stored in the OS kernel", "They replace built-in Python modules", "They provide reusable external functionality", "They are not used in virtual environments"]'),
+(18, 2, 'text_input', 'What command packages a Maven project into a JAR file?', 'mvn package', 'Python Virtual Environments and Maven', NULL),
+(19, 2, 'multiple_choice', 'How does the activate and deactivate scripts modify the $PATH?', 'a', 'Python Virtual Environments and Maven', '["They add the virtual environment''s bin directory to the $PATH", "They remove the virtual environment''s bin directory from the $PATH", "They add the virtual environment''s bin directory to the $PATH and remove the system''s bin directory from the $PATH", "They remove the virtual environment''s bin directory from the $PATH and add the system''s bin directory to the $PATH"]'),
+(20, 2, 'multiple_choice', 'What happens if you run a project without activating it''s virtual environment?', 'b', 'Python Virtual Environments and Maven', '["The project will run successfully", "The project will fail to run", "The project will run with limited functionality", "The project will run with full functionality"]'),
+(21, 3, 'multiple_choice', "What is an EC2 instance?", 'a', 'Deploy on AWS', '["A virtual server in the cloud", "A file storage system", "A container orchestration tool", "A managed database service"]'),
+(22, 3, 'text_input', 'Which port must be open for HTTP web traffic?', '80', 'Deploy on AWS', NULL),
+(23, 3, 'multiple_choice', 'Which protocol is used to securely connect to an EC2 instance from your local machine?', 'b', 'Deploy on AWS', '["HTTP", "SSH", "TCP", "HTTPS"]'),
+(24, 3, 'multiple_choice', 'What is the purpose of a firewall?', 'c', 'Deploy on AWS', '["To increase internet speed", "To manage file storage", "To block unauthorized access to a network", "To clean up viruses from a system"]'),
+(25, 3, 'text_input', 'Write the command to enable a systemd service file called flask-app so it starts on boot.', 'sudo systemctl enable flask-app', 'Deploy on AWS', NULL),
+(26, 3, 'text_input', 'Write the curl command to send a request to a web server running on localhost 5000.', 'curl http://localhost:5000', 'Deploy on AWS', NULL),
+(27, 3, 'text_input', 'Write the command to clone a GitHub repository? Example URL: https://github.com/user/webapp.git', 'git clone https://github.com/user/webapp.git', 'Deploy on AWS', NULL),
+(28, 3, 'multiple_choice', 'What is the package manager primarily used in Amazon Linux?', 'a', 'Deploy on AWS', '["yum", "apt", "brew", "pacman"]'),
+(29, 3, 'multiple_choice', 'Which AWS component controls the inbound and outbound traffic for EC2 instances?', 'a', 'Deploy on AWS', '["Security Group", "VPC", "Subnet", "S3 Bucket"]'),
+(30, 3, 'multiple_choice', 'What is the primary purpose of gunicorn?', 'b', 'Deploy on AWS', '["To serve static files to the user", "To manage multiple worker processes and handle incoming HTTP requests", "To compile Python code to bytecode", "To run a Python application"]')
+ON CONFLICT(id) DO UPDATE SET
+    skill_test_id = excluded.skill_test_id,
+    question_type = excluded.question_type,
+    prompt = excluded.prompt,
+    answer = excluded.answer,
+    category = excluded.category,
+    choices = excluded.choices;
 
-INSERT INTO study_guides (skill_test_id, content) VALUES
-(1, 'Manipulate files and directories in the terminal using various commands.'),
-(1, 'Edit files within the terminal using commands such as nano.'),
-(1, 'Navigate the file system using commands such as pwd, cd, etc.'),
-(1, 'Pipe commands together using the | symbol.'),
-(1, 'Use the man command to view documentation for commands.'),
-(2, 'Create a Python virtual environment and install packages using the requirements.txt file.'),
-(2, 'Answer questions about third-party libraries and other concepts related to virtual environments.'),
-(2, 'Understand the Maven lifecycle and how to use it to build and deploy applications.'),
-(2, 'Answer questions about dependency management, the build process, and other concepts related to Maven.'),
-(2, 'Explain how activate and deactivate scripts modify the $PATH.'),
-(2, 'Explain the contents of the pom.xml file.'),
-(3, 'Copy a systemd .service file into the appropriate location.'),
-(3, 'Know how to launch and SSH into an AWS EC2 instance.'),
-(3, 'Answer questions about EC2, SSH, yum, firewalls, systemd, and curl.'),
-(3, 'Launch a web server using systemd.'),
-(3, 'Understand the purpose of gunicorn and flask.');
+INSERT INTO study_guides (id, skill_test_id, content) VALUES
+(1, 1, 'Manipulate files and directories in the terminal using various commands.'),
+(2, 1, 'Edit files within the terminal using commands such as nano.'),
+(3, 1, 'Navigate the file system using commands such as pwd, cd, etc.'),
+(4, 1, 'Pipe commands together using the | symbol.'),
+(5, 1, 'Use the man command to view documentation for commands.'),
+(6, 2, 'Create a Python virtual environment and install packages using the requirements.txt file.'),
+(7, 2, 'Answer questions about third-party libraries and other concepts related to virtual environments.'),
+(8, 2, 'Understand the Maven lifecycle and how to use it to build and deploy applications.'),
+(9, 2, 'Answer questions about dependency management, the build process, and other concepts related to Maven.'),
+(10, 2, 'Explain how activate and deactivate scripts modify the $PATH.'),
+(11, 2, 'Explain the contents of the pom.xml file.'),
+(12, 3, 'Copy a systemd .service file into the appropriate location.'),
+(13, 3, 'Know how to launch and SSH into an AWS EC2 instance.'),
+(14, 3, 'Answer questions about EC2, SSH, yum, firewalls, systemd, and curl.'),
+(15, 3, 'Launch a web server using systemd.'),
+(16, 3, 'Understand the purpose of gunicorn and flask.')
+ON CONFLICT(id) DO UPDATE SET
+    skill_test_id = excluded.skill_test_id,
+    content = excluded.content;
 
@@ -12,6 +12,8 @@ from datetime import datetime
 # Database file path
 DB_PATH = os.path.join(os.path.dirname(__file__), 'app.db')
 OUTPUT_FILE = sys.argv[1] if len(sys.argv) > 1 else 'database_view.txt'
+# Large write buffer so the streamed rows reach the file in few syscalls
+WRITE_BUFFER_SIZE = 1024 * 1024
 
 def get_db_connection():
     """Get a database connection."""
@@ -39,49 +41,53 @@ def get_table_info(conn, table_name):
     cursor.execute(f"PRAGMA table_info({table_name})")
     return cursor.fetchall()
 
-def format_table_output(conn, table_name, output_lines):
-    """Format a table's data for output."""
-    cursor = conn.cursor()
-    
+def format_table_output(conn, table_name, out):
+    """Write a table's data to the output file, streaming rows from the cursor."""
     # Get table info
     table_info = get_table_info(conn, table_name)
     columns = [col[1] for col in table_info]
     
-    # Get all rows
-    cursor.execute(f"SELECT * FROM {table_name}")
-    rows = cursor.fetchall()
+    # First pass: row count and column widths, measured on the same str()
+    # rendering the rows are written with. Streaming the cursor twice keeps
+    # memory flat without holding the table.
+    select_all = f"SELECT * FROM \"{table_name}\""
+    cursor = conn.execute(select_all)
+    cursor.row_factory = None
+    widths = [len(col) for col in columns]
+    row_count = 0
+    for row in cursor:
+        row_count += 1
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len('NULL' if value is None else str(value)))
     
     # Header
-    output_lines.append(f"\n{'='*80}")
-    output_lines.append(f"TABLE: {table_name.upper()}")
-    output_lines.append(f"{'='*80}")
-    output_lines.append(f"Total rows: {len(rows)}")
-    output_lines.append("")
+    out.write(f"\n{'='*80}\n")
+    out.write(f"TABLE: {table_name.upper()}\n")
+    out.write(f"{'='*80}\n")
+    out.write(f"Total rows: {row_count}\n")
+    out.write("\n")
     
-    if len(rows) == 0:
-        output_lines.append("(No data)")
-        output_lines.append("")
+    if row_count == 0:
+        out.write("(No data)\n")
+        out.write("\n")
         return
     
-    # Calculate column widths
-    col_widths = {}
-    for col in columns:
-        col_widths[col] = max(len(col), max([len(str(row[col]) if row[col] is not None else 'NULL') for row in rows], default=0))
+    col_widths = dict(zip(columns, widths))
     
     # Print header
     header = " | ".join([col.ljust(col_widths[col]) for col in columns])
-    output_lines.append(header)
-    output_lines.append("-" * len(header))
+    out.write(header + "\n")
+    out.write("-" * len(header) + "\n")
     
-    # Print rows
-    for row in rows:
-        row_data = []
-        for col in columns:
-            value = str(row[col]) if row[col] is not None else 'NULL'
-            row_data.append(value.ljust(col_widths[col]))
-        output_lines.append(" | ".join(row_data))
+    # Second pass: print rows through one padded template per table instead
+    # of building and joining a string per cell
+    row_template = " | ".join(f"{{:<{col_widths[col]}}}" for col in columns) + "\n"
+    cursor = conn.execute(select_all)
+    cursor.row_factory = None
+    for row in cursor:
+        out.write(row_template.format(*['NULL' if value is None else str(value) for value in row]))
     
-    output_lines.append("")
+    out.write("\n")
 
 def main():
     """Main function to generate database view."""
@@ -93,23 +99,18 @@ def main():
             print("No tables found in database.")
             return
         
-        output_lines = []
-        output_lines.append("="*80)
-        output_lines.append("DATABASE VIEW")
-        output_lines.append("="*80)
-        output_lines.append(f"Database: {DB_PATH}")
-        output_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output_lines.append(f"Total tables: {len(table_names)}")
-        output_lines.append("")
-        
-        # Format each table
-        for table_name in table_names:
-            format_table_output(conn, table_name, output_lines)
-        
-        # Write to file
-        output_content = "\n".join(output_lines)
-        with open(OUTPUT_FILE, 'w') as f:
-            f.write(output_content)
+        with open(OUTPUT_FILE, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write("="*80 + "\n")
+            f.write("DATABASE VIEW\n")
+            f.write("="*80 + "\n")
+            f.write(f"Database: {DB_PATH}\n")
+            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Total tables: {len(table_names)}\n")
+            f.write("\n")
+            
+            # Format each table straight into the file
+            for table_name in table_names:
+                format_table_output(conn, table_name, f)
         
         print(f"Database view saved to: {OUTPUT_FILE}")
         print(f"Total tables exported: {len(table_names)}")
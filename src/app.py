@@ -1,14 +1,13 @@
 from flask import Flask, jsonify, render_template, request, redirect, url_for, session as flask_session
 import os
 import sys
-import sqlite3
 import json
+import logging
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from database.database import init_database, create_user, get_user, login_user
 from services import (
     start_quiz_service, submit_answer_service, finish_quiz_service,
-    get_quiz_data_service,
-    get_all_answers_with_questions_service,
+    get_quiz_data_service, get_quiz_summary_service,
     get_study_guide_service, get_leaderboard_service 
 )
 from database.db_services import list_skill_tests
@@ -20,6 +19,8 @@ app = Flask(
     static_folder=os.path.join(os.path.dirname(__file__), '..', 'frontend'),
     static_url_path=''
 )
+# Send the database module's startup messages to stderr
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
 init_database()
 # Set secret key for sessions (fallback to a dev default for local use)
 app.secret_key = os.getenv('FLASK_KEY') or 'dev-secret-key' 
@@ -41,12 +42,13 @@ def api_register():
 
     try:
         user_id = create_user(username, password)
-        user = get_user(username)
-    except sqlite3.IntegrityError:
-        return jsonify({'error': 'Username already exists.'}), 409
     except ValueError as exc:
         return jsonify({'error': str(exc)}), 400
 
+    if user_id is None:
+        return jsonify({'error': 'Username already exists.'}), 409
+    user = get_user(username)
+
     flask_session['username'] = username
 
     return jsonify({
@@ -258,11 +260,11 @@ def finish_quiz(session_id):
 @app.route('/results/<int:session_id>')
 def show_results(session_id):
     """Display quiz results."""
-    quiz_data = get_quiz_data_service(session_id)
+    quiz_data = get_quiz_summary_service(session_id)
     if not quiz_data:
         return redirect(url_for('index'))
     
-    all_answers = get_all_answers_with_questions_service(session_id)
+    all_answers = quiz_data.pop('answers')
     # Parse choices JSON for multiple choice questions in results
     for answer in all_answers:
         if answer.get('question_type') == 'multiple_choice' and answer.get('choices'):
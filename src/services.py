@@ -1,16 +1,22 @@
 import json
 import re
+from database.database import transaction
 from database.db_services import (
-    start_quiz_session, finish_quiz_session,
-    get_skill_test_questions, record_user_answer, get_quiz_session,
-    update_question_stats, get_correct_answers, get_incorrect_answers,
-    get_all_answers_with_questions, get_study_guide_by_skill_test, get_leaderboard_by_skill_test
+    start_quiz_session_for_username, finish_quiz_session,
+    get_skill_test_questions, record_user_answer, get_answer_is_correct, get_quiz_session,
+    update_question_stats, get_answer_counts,
+    get_all_answers_with_questions, get_quiz_summary, get_study_guide_by_skill_test, get_leaderboard_by_skill_test
 )
-from database.database import create_user, get_user
+
+# Runs of whitespace, collapsed to one space when comparing answers
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _normalize_answer(answer: str) -> str:
+    """Lowercase an answer and collapse its whitespace for comparison."""
+    return _WHITESPACE_RE.sub(' ', answer.strip().lower())
 
 def start_quiz_service(username: str, skill_test_id: int):
     """Start a new quiz session for a user. Returns session data with questions."""
-    user = get_user(username) or get_user(create_user(username))
     questions = get_skill_test_questions(skill_test_id, limit=10)
     # Parse choices JSON for multiple choice questions
     for question in questions:
@@ -20,17 +26,23 @@ def start_quiz_service(username: str, skill_test_id: int):
             except (json.JSONDecodeError, TypeError):
                 question['choices'] = []
     return {
-        'session_id': start_quiz_session(user['id'], skill_test_id, len(questions)),
+        'session_id': start_quiz_session_for_username(username, skill_test_id, len(questions)),
         'questions': questions
     }
 
 def submit_answer_service(session_id: int, question_id: int, user_answer: str, correct_answer: str, question_type: str = 'text_input'):
     """Submit an answer and record if it's correct."""
-    user_normalized = re.sub(r'\s+', ' ', user_answer.strip().lower())
-    correct_normalized = re.sub(r'\s+', ' ', correct_answer.strip().lower())
-    is_correct = user_normalized.strip().lower() == correct_normalized.strip().lower()
-    record_user_answer(session_id, question_id, user_answer, is_correct)
-    update_question_stats(question_id, int(is_correct), int(not is_correct))
+    is_correct = _normalize_answer(user_answer) == _normalize_answer(correct_answer)
+    # Commit the answer and the stats update together. Re-answering replaces
+    # the saved answer, so the stats only change by the difference.
+    with transaction():
+        was_correct = get_answer_is_correct(session_id, question_id)
+        record_user_answer(session_id, question_id, user_answer, is_correct)
+        if was_correct is None:
+            update_question_stats(question_id, int(is_correct), int(not is_correct))
+        elif was_correct != is_correct:
+            change = 1 if is_correct else -1
+            update_question_stats(question_id, change, -change)
     return is_correct
 
 def finish_quiz_service(session_id: int):
@@ -39,14 +51,12 @@ def finish_quiz_service(session_id: int):
     if not session:
         return None
     
-    correct_answers = get_correct_answers(session_id)
-    incorrect_answers = get_incorrect_answers(session_id)
-    total_answered = len(correct_answers) + len(incorrect_answers)
+    correct_count, incorrect_count = get_answer_counts(session_id)
+    total_answered = correct_count + incorrect_count
     
     if total_answered == 0:
         return None
     
-    correct_count = len(correct_answers)
     score = (correct_count / total_answered) * 100
     
     finish_quiz_session(session_id, score, total_answered)
@@ -56,13 +66,17 @@ def finish_quiz_service(session_id: int):
         'score': score,
         'total_questions': total_answered,
         'correct_count': correct_count,
-        'incorrect_count': len(incorrect_answers)
+        'incorrect_count': incorrect_count
     }
 
 def get_quiz_data_service(session_id: int):
     """Get quiz session data for display."""
     return get_quiz_session(session_id)
 
+def get_quiz_summary_service(session_id: int):
+    """Get a quiz session with all of its answers for the results page."""
+    return get_quiz_summary(session_id)
+
 def get_study_guide_service(skill_test_id: int):
     """Get study guide content for a skill test."""
     return get_study_guide_by_skill_test(skill_test_id)
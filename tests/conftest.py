@@ -27,12 +27,6 @@ def test_env(monkeypatch, tmp_path):
 
     with db_module.get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("ALTER TABLE questions ADD COLUMN correct_answers INTEGER DEFAULT 0")
-        cursor.execute("ALTER TABLE questions ADD COLUMN incorrect_answers INTEGER DEFAULT 0")
-        cursor.execute(
-            "UPDATE questions SET correct_answers = COALESCE(correct_answers, 0), incorrect_answers = COALESCE(incorrect_answers, 0)"
-        )
-
         cursor.execute("INSERT INTO skill_tests (name, description) VALUES ('Sample Test', 'Sample Description')")
         skill_test_id = cursor.lastrowid
 
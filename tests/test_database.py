@@ -1,4 +1,6 @@
+import hashlib
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -74,3 +76,189 @@ def test_get_db_connection_uses_patched_path(test_env):
         tables = {row[0] for row in cursor.fetchall()}
     assert "users" in tables
     assert str(db.DB_PATH).endswith("app.db")
+
+
+def test_legacy_pbkdf2_hash_is_verified_and_upgraded(test_env):
+    db = test_env["db"]
+    salt = bytes(16)
+    derived = hashlib.pbkdf2_hmac("sha256", b"oldpass", salt, db.PBKDF2_ITERATIONS)
+    legacy_hash = f"{salt.hex()}:{derived.hex()}"
+    assert db.verify_password("oldpass", legacy_hash)
+    assert not db.verify_password("wrong", legacy_hash)
+
+    user_id = db.create_user("old_timer")
+    db.update_user_password(user_id, legacy_hash)
+    assert db.login_user("old_timer", "oldpass")["id"] == user_id
+    assert db.get_user("old_timer")["password_hash"].startswith("scrypt:")
+
+
+def test_init_database_records_schema_version(test_env):
+    db = test_env["db"]
+    with db.get_db_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION
+    db.init_database()
+    with db.get_db_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION
+
+
+def test_create_users_bulk_inserts_all_or_nothing(test_env):
+    db = test_env["db"]
+
+    assert db.create_users_bulk([(" bulk_a ", "pw_a"), ("bulk_b", None)]) == 2
+    assert db.login_user("bulk_a", "pw_a")
+    assert db.get_user("bulk_b")["password_hash"] == ""
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db.create_users_bulk([("bulk_c", None), ("bulk_a", None)])
+    assert db.get_user("bulk_c") is None
+
+
+def test_create_user_returns_none_for_taken_username(test_env):
+    db = test_env["db"]
+
+    assert db.create_user("dupe", "pw") is not None
+    assert db.create_user(" dupe ", "other") is None
+    assert db.login_user("dupe", "pw")
+
+
+def test_pooled_connections_are_shared_across_threads(test_env):
+    db = test_env["db"]
+    names = [f"thread_user_{i}" for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        ids = list(executor.map(db.create_user, names))
+        users = list(executor.map(db.get_user, names))
+
+    assert all(ids)
+    assert [user["id"] for user in users] == ids
+
+
+def test_transaction_groups_writes(test_env):
+    db = test_env["db"]
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.create_user("tx_a", "pw")
+            db.create_user("tx_b", "pw")
+            raise RuntimeError("abort")
+    assert db.get_user("tx_a") is None and db.get_user("tx_b") is None
+
+    with db.transaction():
+        db.create_user("tx_c", "pw")
+        with pytest.raises(sqlite3.IntegrityError):
+            db.create_users_bulk([("tx_d", None), ("tx_c", None)])
+    assert db.get_user("tx_c") is not None
+    assert db.get_user("tx_d") is None
+
+
+def test_reads_inside_transaction_see_its_writes(test_env):
+    db = test_env["db"]
+
+    with db.transaction():
+        db.create_user("zed")
+        assert db.get_user("zed") is not None
+        # Other threads keep reading committed data from the pooled readers
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(db.get_user, "zed").result() is None
+    assert db.get_user("zed") is not None
+
+
+def test_pooled_readers_are_query_only(test_env):
+    db = test_env["db"]
+
+    with db._read_conn() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO users (username) VALUES ('sneaky')")
+
+
+def test_init_database_adds_question_stats_columns(test_env):
+    db = test_env["db"]
+
+    with db.get_db_connection() as conn:
+        conn.execute("ALTER TABLE questions DROP COLUMN correct_answers")
+        conn.execute("ALTER TABLE questions DROP COLUMN incorrect_answers")
+        conn.execute("PRAGMA user_version = 5")
+        conn.commit()
+
+    db.init_database()
+
+    with db.get_db_connection() as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(questions)")}
+        assert {"correct_answers", "incorrect_answers"} <= columns
+        assert conn.execute("SELECT COUNT(*) FROM questions WHERE correct_answers != 0").fetchone()[0] == 0
+
+
+def _seed_snapshot(db):
+    with db.get_db_connection() as conn:
+        return [
+            [tuple(row) for row in conn.execute(f"SELECT * FROM {table} ORDER BY id")]
+            for table in ("skill_tests", "questions", "study_guides")
+        ]
+
+
+def test_init_database_reloads_seed_when_insert_data_changes(test_env):
+    db = test_env["db"]
+    seeded = _seed_snapshot(db)
+
+    db.init_database()
+    assert _seed_snapshot(db) == seeded
+
+    user_id = db.create_user("seed_reader")
+    with db.get_db_connection() as conn:
+        quiz_result_id = conn.execute(
+            "INSERT INTO quiz_results (skill_test_id, user_id, start_time) VALUES (1, ?, CURRENT_TIMESTAMP)",
+            (user_id,),
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO quiz_result_questions (quiz_result_id, question_id, user_answer, is_correct) VALUES (?, 1, 'ls -a', 1)",
+            (quiz_result_id,),
+        )
+        conn.execute("UPDATE questions SET correct_answers = 3, incorrect_answers = 2 WHERE id = 1")
+        conn.execute("UPDATE app_meta SET value = 'stale' WHERE key = 'seed_hash'")
+        conn.execute("UPDATE questions SET prompt = 'edited' WHERE id = 1")
+        conn.commit()
+
+    db.init_database()
+
+    with db.get_db_connection() as conn:
+        prompt, correct, incorrect = conn.execute(
+            "SELECT prompt, correct_answers, incorrect_answers FROM questions WHERE id = 1"
+        ).fetchone()
+        answer = conn.execute(
+            "SELECT question_id, user_answer FROM quiz_result_questions WHERE quiz_result_id = ?",
+            (quiz_result_id,),
+        ).fetchone()
+        sample_tests = conn.execute("SELECT COUNT(*) FROM skill_tests WHERE id = ?", (test_env["skill_test_id"],)).fetchone()[0]
+    # Content comes back from insert_data.sql; answers, stats and other rows stay
+    assert prompt == seeded[1][0][3]
+    assert (correct, incorrect) == (3, 2)
+    assert tuple(answer) == (1, "ls -a")
+    assert sample_tests == 1
+
+
+def test_concurrent_init_database_loads_seed_once(test_env, monkeypatch, tmp_path):
+    db = test_env["db"]
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "sequential.db"))
+    db.init_database()
+    expected = _seed_snapshot(db)
+
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "concurrent.db"))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: db.init_database(), range(4)))
+
+    assert _seed_snapshot(db) == expected
+
+
+def test_pool_closes_previous_connections_when_path_changes(test_env, monkeypatch, tmp_path):
+    db = test_env["db"]
+    db.get_user("nobody")
+    old_writer = db._WRITER
+    old_readers = list(db._READERS.queue)
+
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "other.db"))
+    db.init_database()
+    db.get_user("nobody")
+
+    for conn in [old_writer, *old_readers]:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
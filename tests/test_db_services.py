@@ -45,6 +45,8 @@ def test_record_user_answer_and_queries(test_env):
     incorrect = db_services.get_incorrect_answers(session_id)
     assert len(correct) == 1 and correct[0]["question_id"] == first_q
     assert len(incorrect) == 1 and incorrect[0]["question_id"] == second_q
+    assert db_services.get_answers_partitioned(session_id) == (correct, incorrect)
+    assert db_services.get_answer_counts(session_id) == (1, 1)
 
     all_answers = db_services.get_all_answers_with_questions(session_id)
     assert {answer["question_id"] for answer in all_answers} == {first_q, second_q}
@@ -81,3 +83,132 @@ def test_get_leaderboard_by_skill_test(test_env):
     assert leaderboard[0]["username"] == "leader_user"
     assert leaderboard[0]["score"] == 100
 
+
+
+def test_update_question_stats_accumulates(test_env):
+    db = test_env["db"]
+    db_services = test_env["db_services"]
+    question_id = test_env["question_ids"][1]
+
+    db_services.update_question_stats(question_id, 1, 0)
+    db_services.update_question_stats(question_id, 0, 1)
+    db_services.update_question_stats(question_id, 1, 0)
+
+    with db.get_db_connection() as conn:
+        row = conn.execute(
+            "SELECT correct_answers, incorrect_answers FROM questions WHERE id = ?", (question_id,)
+        ).fetchone()
+    assert row["correct_answers"] == 2
+    assert row["incorrect_answers"] == 1
+
+
+def test_update_question_stats_many(test_env):
+    db = test_env["db"]
+    db_services = test_env["db_services"]
+    first_q, second_q = test_env["question_ids"]
+
+    db_services.update_question_stats_many([(first_q, True), (second_q, False), (first_q, True)])
+
+    with db.get_db_connection() as conn:
+        rows = {
+            row["id"]: (row["correct_answers"], row["incorrect_answers"])
+            for row in conn.execute("SELECT id, correct_answers, incorrect_answers FROM questions WHERE id IN (?, ?)", (first_q, second_q))
+        }
+    assert rows == {first_q: (2, 0), second_q: (0, 1)}
+
+
+def test_record_user_answers_bulk_upserts(test_env):
+    db = test_env["db"]
+    db_services = test_env["db_services"]
+    user_id = db.create_user("bulk_answer_user", "pwd")
+    session_id = db_services.start_quiz_session(user_id, test_env["skill_test_id"], total_questions=2)
+    first_q, second_q = test_env["question_ids"]
+
+    db_services.record_user_answer(session_id, first_q, "B", False)
+    db_services.record_user_answers_bulk(session_id, [(first_q, "A", True), (second_q, "hi", True)])
+
+    answers = db_services.get_all_answers_with_questions(session_id)
+    assert [(answer["question_id"], answer["user_answer"], answer["is_correct"]) for answer in answers] == [
+        (first_q, "A", 1),
+        (second_q, "hi", 1),
+    ]
+
+
+def test_leaderboard_cache_invalidated_on_finish(test_env):
+    db = test_env["db"]
+    db_services = test_env["db_services"]
+    skill_test_id = test_env["skill_test_id"]
+    assert db_services.get_leaderboard_by_skill_test(skill_test_id) == []
+
+    user_id = db.create_user("late_leader", "pwd")
+    session_id = db_services.start_quiz_session(user_id, skill_test_id, total_questions=1)
+    with db.get_db_connection() as conn:
+        conn.execute("UPDATE quiz_results SET start_time = DATETIME('now', '-1 day') WHERE id = ?", (session_id,))
+        conn.commit()
+    db_services.finish_quiz_session(session_id, 90, 1)
+
+    leaderboard = db_services.get_leaderboard_by_skill_test(skill_test_id)
+    assert [entry["username"] for entry in leaderboard] == ["late_leader"]
+    leaderboard[0]["username"] = "mutated"
+    assert db_services.get_leaderboard_by_skill_test(skill_test_id)[0]["username"] == "late_leader"
+
+
+def test_content_cache_expires_after_ttl(test_env, monkeypatch):
+    db = test_env["db"]
+    db_services = test_env["db_services"]
+    skill_test_id = test_env["skill_test_id"]
+    now = [1000.0]
+    monkeypatch.setattr(db_services.time, "monotonic", lambda: now[0])
+    assert len(db_services.get_study_guide_by_skill_test(skill_test_id)) == 2
+    assert "Sample Test" in [test["name"] for test in db_services.list_skill_tests()]
+
+    with db.get_db_connection() as conn:
+        conn.execute("INSERT INTO study_guides (skill_test_id, content) VALUES (?, 'Guide 3')", (skill_test_id,))
+        conn.execute("UPDATE skill_tests SET name = 'Renamed Test' WHERE id = ?", (skill_test_id,))
+        conn.commit()
+    assert len(db_services.get_study_guide_by_skill_test(skill_test_id)) == 2
+    assert "Sample Test" in [test["name"] for test in db_services.list_skill_tests()]
+
+    now[0] += db_services.CONTENT_CACHE_TTL
+    assert len(db_services.get_study_guide_by_skill_test(skill_test_id)) == 3
+    assert "Renamed Test" in [test["name"] for test in db_services.list_skill_tests()]
+
+
+def test_get_quiz_summary(test_env):
+    db = test_env["db"]
+    db_services = test_env["db_services"]
+    user_id = db.create_user("summary_user", "pwd")
+    session_id = db_services.start_quiz_session(user_id, test_env["skill_test_id"], total_questions=2)
+    first_q, second_q = test_env["question_ids"]
+
+    summary = db_services.get_quiz_summary(session_id)
+    assert summary["username"] == "summary_user" and summary["answers"] == []
+
+    db_services.record_user_answer(session_id, second_q, "no", False)
+    db_services.record_user_answer(session_id, first_q, "A", True)
+
+    summary = db_services.get_quiz_summary(session_id)
+    assert summary["id"] == session_id
+    assert summary["answers"] == db_services.get_all_answers_with_questions(session_id)
+    assert db_services.get_quiz_summary(session_id + 1000) is None
+
+    # An answer whose question no longer exists is left out, as in the inner join
+    with db.get_db_connection() as conn:
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.execute(
+            "INSERT INTO quiz_result_questions (quiz_result_id, question_id, user_answer, is_correct) VALUES (?, 99999, 'x', 0)",
+            (session_id,),
+        )
+        conn.commit()
+    summary = db_services.get_quiz_summary(session_id)
+    assert [answer["question_id"] for answer in summary["answers"]] == [first_q, second_q]
+    assert summary["answers"] == db_services.get_all_answers_with_questions(session_id)
+
+
+def test_quiz_summary_query_searches_by_result_id(test_env):
+    db = test_env["db"]
+    db_services = test_env["db_services"]
+
+    with db.get_db_connection() as conn:
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + db_services.SQL_SELECT_QUIZ_SUMMARY, (1,))]
+    assert not any(step.startswith("SCAN qrq") for step in plan)
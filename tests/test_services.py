@@ -10,6 +10,18 @@ def test_start_quiz_service_parses_choices(test_env):
     assert mc_question["choices"] == ["A", "B"]
 
 
+def test_start_quiz_service_creates_missing_user(test_env):
+    services = test_env["services"]
+    db = test_env["db"]
+    db_services = test_env["db_services"]
+
+    result = services.start_quiz_service("first_timer", test_env["skill_test_id"])
+
+    user = db.get_user("first_timer")
+    assert user is not None
+    assert db_services.get_quiz_session(result["session_id"])["user_id"] == user["id"]
+
+
 def test_submit_answer_service_updates_stats(test_env):
     db = test_env["db"]
     db_services = test_env["db_services"]
@@ -28,6 +40,28 @@ def test_submit_answer_service_updates_stats(test_env):
     assert row["incorrect_answers"] == 0
 
 
+def test_resubmitting_an_answer_does_not_double_count_stats(test_env):
+    db = test_env["db"]
+    db_services = test_env["db_services"]
+    services = test_env["services"]
+    user_id = db.create_user("resubmit_user", "pwd")
+    session_id = db_services.start_quiz_session(user_id, test_env["skill_test_id"], total_questions=2)
+    question_id = test_env["question_ids"][1]
+
+    def stats():
+        with db.get_db_connection() as conn:
+            return tuple(conn.execute(
+                "SELECT correct_answers, incorrect_answers FROM questions WHERE id = ?", (question_id,)
+            ).fetchone())
+
+    assert not services.submit_answer_service(session_id, question_id, "bye", "hi")
+    assert stats() == (0, 1)
+    assert not services.submit_answer_service(session_id, question_id, "hello", "hi")
+    assert stats() == (0, 1)
+    assert services.submit_answer_service(session_id, question_id, "hi", "hi")
+    assert stats() == (1, 0)
+
+
 def test_finish_quiz_service_scores_results(test_env):
     db = test_env["db"]
     db_services = test_env["db_services"]
@@ -93,3 +127,17 @@ def test_study_guide_and_leaderboard_services(test_env):
 
     leaderboard = services.get_leaderboard_service(test_env["skill_test_id"])
     assert leaderboard[0]["username"] == "boarduser"
+
+
+def test_quiz_round_trip_on_initialized_schema(test_env):
+    services = test_env["services"]
+    quiz = services.start_quiz_service("round_trip", test_env["skill_test_id"])
+
+    for question in quiz["questions"]:
+        assert services.submit_answer_service(
+            quiz["session_id"], question["id"], question["answer"], question["answer"], question["question_type"]
+        )
+
+    result = services.finish_quiz_service(quiz["session_id"])
+    assert result["correct_count"] == len(quiz["questions"])
+    assert result["score"] == 100
@@ -0,0 +1,63 @@
+import io
+import sqlite3
+
+from database import view_database
+
+
+def _render(conn, table_name):
+    out = io.StringIO()
+    view_database.format_table_output(conn, table_name, out)
+    return out.getvalue()
+
+
+def test_format_table_output_widths_match_rendered_real_values():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE scores (id INTEGER, score REAL, note TEXT)")
+    conn.executemany("INSERT INTO scores VALUES (?, ?, ?)", [(1, 200 / 3, None), (2, 1e20, "ok")])
+
+    lines = _render(conn, "scores").splitlines()
+    header = next(line for line in lines if line.startswith("id"))
+    rows = [line for line in lines if line[:1] in ("1", "2")]
+
+    assert "Total rows: 2" in lines
+    assert rows == [
+        "1  | 66.66666666666667 | NULL",
+        "2  | 1e+20             | ok  ",
+    ]
+    assert all(len(row) == len(header) for row in rows)
+
+
+def _legacy_format_table_output(conn, table_name):
+    """The original fetchall-based formatter, kept as the reference output."""
+    columns = [col[1] for col in conn.execute(f"PRAGMA table_info({table_name})")]
+    rows = conn.execute(f"SELECT * FROM {table_name}").fetchall()
+    output_lines = [f"\n{'='*80}", f"TABLE: {table_name.upper()}", f"{'='*80}", f"Total rows: {len(rows)}", ""]
+    if len(rows) == 0:
+        output_lines += ["(No data)", ""]
+        return output_lines
+    col_widths = {}
+    for col in columns:
+        col_widths[col] = max(len(col), max([len(str(row[col]) if row[col] is not None else 'NULL') for row in rows], default=0))
+    header = " | ".join([col.ljust(col_widths[col]) for col in columns])
+    output_lines += [header, "-" * len(header)]
+    for row in rows:
+        output_lines.append(" | ".join(
+            (str(row[col]) if row[col] is not None else 'NULL').ljust(col_widths[col]) for col in columns
+        ))
+    output_lines.append("")
+    return output_lines
+
+
+def test_format_table_output_matches_legacy_formatter():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE quiz_results (id INTEGER, score REAL, end_time TEXT, label TEXT)")
+    conn.execute("CREATE TABLE empty_table (id INTEGER)")
+    conn.executemany(
+        "INSERT INTO quiz_results VALUES (?, ?, ?, ?)",
+        [(1, 200 / 3, "2024-01-01 10:00:00", None), (22, 0.1 + 0.2, None, "héllo"), (333, 1e20, "", "x")],
+    )
+
+    for table_name in ("quiz_results", "empty_table"):
+        assert _render(conn, table_name) == "\n".join(_legacy_format_table_output(conn, table_name)) + "\n"